@@ -1,6 +1,15 @@
 from openai import OpenAI
 from typing import Optional
 from datetime import datetime
+import re
+
+PROJECT_NAME_LINE_RE = re.compile(r'^(\*\*Project Name:\*\*).*$', re.MULTILINE)
+MEETING_DATE_LINE_RE = re.compile(r'^(\*\*Meeting Date:\*\*).*$', re.MULTILINE)
+
+def rewrite_mom_header(mom: str, project_name: str = "") -> str:
+    """Point a MoM taken from another meeting at this project and today's date"""
+    mom = PROJECT_NAME_LINE_RE.sub(lambda m: f"{m.group(1)} {project_name or 'Meeting Project'}", mom)
+    return MEETING_DATE_LINE_RE.sub(lambda m: f"{m.group(1)} {datetime.now().strftime('%Y-%m-%d')}", mom)
 
 class OpenAIService:
     def __init__(self, api_key: str, model: str = "gpt-4o-mini"):
@@ -126,6 +135,60 @@ Please check your API key or try again later."""
         # If we get here, all models failed
         return None
 
+    def update_mom(self, existing_mom: str, added_text: str, removed_text: str = "", project_name: str = "") -> Optional[str]:
+        """Update an existing MoM from the changes between two near-identical transcripts"""
+
+        system_prompt = f"""You are an AI assistant specialized in maintaining structured Minutes of Meeting (MoM).
+
+You will receive an existing MoM for project "{project_name or "Meeting Project"}" and the lines that were added to and removed from the transcript it was generated from.
+
+Guidelines:
+1. Keep the existing MoM structure and wording wherever the changes do not affect it
+2. Add discussion points, decisions and action items introduced by the added lines
+3. Remove or correct content that only came from the removed lines
+4. Do not invent content that is not supported by the changes
+
+IMPORTANT:
+- Start your response directly with "**Minutes of Meeting**"
+- Do NOT include any introductory text
+- Return the complete updated MoM in markdown format"""
+
+        user_prompt = f"""Existing MoM:
+
+{existing_mom}
+
+Lines added to the transcript:
+
+{added_text or "(none)"}
+
+Lines removed from the transcript:
+
+{removed_text or "(none)"}"""
+
+        models_to_try = [self.model] + self.fallback_models
+
+        for model in models_to_try:
+            try:
+                response = self.client.chat.completions.create(
+                    model=model,
+                    max_tokens=2000,
+                    temperature=0.3,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ]
+                )
+
+                if response.choices and len(response.choices) > 0:
+                    # The existing MoM may come from another project or day
+                    return rewrite_mom_header(response.choices[0].message.content.strip(), project_name)
+
+            except Exception as e:
+                print(f"Model {model} failed: {e}")
+                continue  # Try next model
+
+        return None
+
     def test_connection(self) -> bool:
         """Test if the API connection is working"""
         try:
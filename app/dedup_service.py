@@ -0,0 +1,292 @@
+import difflib
+import hashlib
+import json
+import os
+import random
+import re
+import tempfile
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+WORD_RE = re.compile(r'\w+')
+
+SHINGLE_SIZE = 5
+NUM_PERM = 64
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+DEFAULT_THRESHOLD = 0.8
+
+# Transcripts are diffed sentence by sentence; run-on "sentences" longer than
+# this (unpunctuated speech-to-text output) are diffed word by word instead
+SENTENCE_RE = re.compile(r'[^.!?\n]+[.!?]*')
+MAX_SENTENCE_CHARS = 300
+
+# Universal hashing (a * x + b) mod p, seeded so signatures stay stable across runs
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+_rng = random.Random(1337)
+PERMUTATIONS = [(_rng.randint(1, MERSENNE_PRIME - 1), _rng.randint(0, MERSENNE_PRIME - 1)) for _ in range(NUM_PERM)]
+
+# Streamlit sessions are threads of one process, so every reload-modify-save
+# of an index file is serialised through this lock
+_index_lock = threading.RLock()
+
+def normalize_transcript(transcript: str) -> List[str]:
+    """Casefold a transcript and split it into words in any script, dropping punctuation"""
+    return WORD_RE.findall((transcript or "").casefold())
+
+def can_fingerprint(transcript: str) -> bool:
+    """Transcripts shorter than one shingle are too short to compare"""
+    return len(normalize_transcript(transcript)) >= SHINGLE_SIZE
+
+def transcript_hash(transcript: str) -> str:
+    """Exact-match hash of a normalized transcript"""
+    return hashlib.sha256(" ".join(normalize_transcript(transcript)).encode('utf-8')).hexdigest()
+
+def _shingles(words: List[str]) -> Set[int]:
+    shingles = set()
+    for i in range(len(words) - SHINGLE_SIZE + 1):
+        shingle = " ".join(words[i:i + SHINGLE_SIZE]).encode('utf-8')
+        shingles.add(int.from_bytes(hashlib.blake2b(shingle, digest_size=4).digest(), 'big'))
+    return shingles
+
+def minhash_signature(transcript: str) -> Optional[List[int]]:
+    """MinHash signature of a transcript's word shingles, or None if it is too short"""
+    shingles = _shingles(normalize_transcript(transcript))
+    if not shingles:
+        return None
+    return [
+        min(((a * s + b) % MERSENNE_PRIME) & MAX_HASH for s in shingles)
+        for a, b in PERMUTATIONS
+    ]
+
+def estimate_similarity(signature_a: List[int], signature_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures"""
+    if not signature_a or len(signature_a) != len(signature_b):
+        return 0.0
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / len(signature_a)
+
+def _band_keys(signature: List[int]) -> List[str]:
+    return [
+        f"{band}:" + ",".join(str(v) for v in signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND])
+        for band in range(NUM_BANDS)
+    ]
+
+def _diff_units(transcript: str) -> List[str]:
+    units = []
+    for sentence in SENTENCE_RE.findall(transcript or ""):
+        sentence = sentence.strip()
+        if len(sentence) > MAX_SENTENCE_CHARS:
+            units.extend(sentence.split())
+        elif sentence:
+            units.append(sentence)
+    return units
+
+def transcript_changes(old_transcript: str, new_transcript: str) -> Tuple[str, str]:
+    """Return the (added, removed) text between two transcripts.
+
+    The diff works on sentences rather than lines, so a transcript pasted as
+    one long paragraph only reports the sentences that actually changed.
+    """
+    old_units = _diff_units(old_transcript)
+    new_units = _diff_units(new_transcript)
+    added, removed = [], []
+    matcher = difflib.SequenceMatcher(None, old_units, new_units, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag in ('replace', 'delete'):
+            removed.append(" ".join(old_units[i1:i2]))
+        if tag in ('replace', 'insert'):
+            added.append(" ".join(new_units[j1:j2]))
+    return "\n".join(added), "\n".join(removed)
+
+class TranscriptIndex:
+    """MinHash/LSH index of saved transcripts across all projects.
+
+    Candidates are looked up through LSH band buckets, so a query only
+    compares signatures against meetings that share at least one band
+    rather than against every stored meeting. ``load_transcripts`` yields
+    (project_name, meeting_id, transcript) for every stored meeting and is
+    used to rebuild the index whenever its file is missing or outdated.
+    """
+
+    def __init__(self, index_file: Path, load_transcripts: Callable[[], Iterable[Tuple[str, str, str]]]):
+        self.index_file = Path(index_file)
+        self.load_transcripts = load_transcripts
+        self.entries: Dict[str, Dict] = {}
+        self.buckets: Dict[str, Set[str]] = {}
+        self._loaded = False
+        self._loaded_stamp: Optional[Tuple[int, int]] = None
+        # Fingerprint of the last transcript seen, so saving and then looking up
+        # the same transcript only computes its MinHash once
+        self._last_fingerprint: Optional[Tuple[str, str, List[int]]] = None
+
+    @staticmethod
+    def make_key(project_name: str, meeting_id: str) -> str:
+        return f"{project_name}/{meeting_id}"
+
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.index_file.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_ino
+
+    def _set_entries(self, entries: Dict[str, Dict]):
+        self.entries = entries
+        self.buckets = {}
+        for key, entry in entries.items():
+            self._add_to_buckets(key, entry['signature'])
+        self._loaded = True
+
+    def _load(self):
+        """(Re)load the index from disk if it changed since the last load; caller holds _index_lock"""
+        stamp = self._file_stamp()
+        if self._loaded and stamp == self._loaded_stamp:
+            return
+
+        data = None
+        if stamp is not None:
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception:
+                data = None
+        if not data or data.get('num_perm') != NUM_PERM:
+            # Missing, unreadable or built with other MinHash parameters
+            self._rebuild()
+            return
+        self._set_entries(data.get('meetings', {}))
+        self._loaded_stamp = stamp
+
+    def _rebuild(self):
+        """Fingerprint every stored meeting from scratch; caller holds _index_lock"""
+        entries = {}
+        for project_name, meeting_id, transcript in self.load_transcripts():
+            if can_fingerprint(transcript):
+                entries[self.make_key(project_name, meeting_id)] = {
+                    'hash': transcript_hash(transcript),
+                    'signature': minhash_signature(transcript)
+                }
+        self._set_entries(entries)
+        # If the save fails the stamp stays None, so the in-memory index is
+        # kept instead of being rebuilt on every call
+        self._loaded_stamp = None
+        self._save()
+
+    def _save(self):
+        """Atomically replace the index file; caller holds _index_lock"""
+        tmp_name = None
+        try:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.index_file.parent,
+                                             prefix=f"{self.index_file.name}.", suffix='.tmp',
+                                             delete=False) as f:
+                tmp_name = f.name
+                json.dump({'num_perm': NUM_PERM, 'meetings': self.entries}, f)
+            os.replace(tmp_name, self.index_file)
+            self._loaded_stamp = self._file_stamp()
+        except Exception as e:
+            print(f"Failed to save transcript index: {e}")
+            if tmp_name:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
+
+    def _add_to_buckets(self, key: str, signature: List[int]):
+        for band_key in _band_keys(signature):
+            self.buckets.setdefault(band_key, set()).add(key)
+
+    def _remove_from_buckets(self, key: str):
+        entry = self.entries.get(key)
+        if not entry:
+            return
+        for band_key in _band_keys(entry['signature']):
+            bucket = self.buckets.get(band_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band_key]
+
+    def _fingerprint(self, transcript: str, known_signature: Optional[List[int]] = None) -> Optional[Tuple[str, List[int]]]:
+        """Return (hash, signature) for a transcript, or None if it is too short to fingerprint"""
+        if self._last_fingerprint and self._last_fingerprint[0] == transcript:
+            return self._last_fingerprint[1], self._last_fingerprint[2]
+        if not can_fingerprint(transcript):
+            return None
+        signature = known_signature or minhash_signature(transcript)
+        self._last_fingerprint = (transcript, transcript_hash(transcript), signature)
+        return self._last_fingerprint[1], signature
+
+    def update(self, project_name: str, meeting_id: str, transcript: str):
+        """Fingerprint a meeting's transcript, or drop it if it is too short to fingerprint"""
+        key = self.make_key(project_name, meeting_id)
+        fingerprintable = can_fingerprint(transcript)
+        with _index_lock:
+            self._load()
+            existing = self.entries.get(key)
+            if existing and fingerprintable and existing['hash'] == transcript_hash(transcript):
+                # Unchanged: remember the stored signature for the lookup that usually follows
+                self._fingerprint(transcript, existing['signature'])
+                return
+            if not existing and not fingerprintable:
+                return
+
+        # The MinHash is the slow part, so it is computed outside the lock
+        fingerprint = self._fingerprint(transcript)
+        with _index_lock:
+            self._load()
+            self._remove_from_buckets(key)
+            self.entries.pop(key, None)
+            if fingerprint is not None:
+                exact_hash, signature = fingerprint
+                self.entries[key] = {'hash': exact_hash, 'signature': signature}
+                self._add_to_buckets(key, signature)
+            self._save()
+
+    def remove(self, project_name: str, meeting_id: Optional[str] = None):
+        """Drop one meeting, or every meeting of a project when no ID is given"""
+        with _index_lock:
+            self._load()
+            if meeting_id is not None:
+                keys = [self.make_key(project_name, meeting_id)]
+            else:
+                prefix = f"{project_name}/"
+                keys = [key for key in self.entries if key.startswith(prefix)]
+            changed = False
+            for key in keys:
+                if key in self.entries:
+                    self._remove_from_buckets(key)
+                    del self.entries[key]
+                    changed = True
+            if changed:
+                self._save()
+
+    def find_similar(self, transcript: str, exclude_key: Optional[str] = None,
+                     threshold: float = DEFAULT_THRESHOLD) -> List[Tuple[str, float, bool]]:
+        """Return (key, similarity, exact) for stored transcripts similar to this one, best first.
+
+        The similarity is an estimate and can reach 1.0 for transcripts that
+        still differ slightly, so identical transcripts are flagged by ``exact``.
+        """
+        fingerprint = self._fingerprint(transcript)
+        if fingerprint is None:
+            return []
+        exact_hash, signature = fingerprint
+
+        with _index_lock:
+            self._load()
+            candidates = set()
+            for band_key in _band_keys(signature):
+                candidates.update(self.buckets.get(band_key, ()))
+            candidates.discard(exclude_key)
+            candidate_entries = [(key, self.entries[key]) for key in candidates]
+
+        matches = []
+        for key, entry in candidate_entries:
+            exact = entry['hash'] == exact_hash
+            similarity = 1.0 if exact else estimate_similarity(signature, entry['signature'])
+            if similarity >= threshold:
+                matches.append((key, similarity, exact))
+        matches.sort(key=lambda match: (match[2], match[1]), reverse=True)
+        return matches
@@ -3,36 +3,13 @@ import os
 from datetime import datetime
 from dotenv import load_dotenv
 from models import DataManager
-from ai_service import OpenAIService
-import re
+from ai_service import OpenAIService, rewrite_mom_header
+from export_service import ExportService, meeting_mom, safe_filename
+from dedup_service import transcript_changes
 
 # Load environment variables
 load_dotenv()
 
-def markdown_to_clean_text(markdown_text):
-    """Convert markdown text to clean, readable text"""
-    if not markdown_text:
-        return ""
-
-    # Remove markdown formatting
-    clean_text = markdown_text
-
-    # Remove bold/italic markers
-    clean_text = re.sub(r'\*\*(.*?)\*\*', r'\1', clean_text)  # Bold
-    clean_text = re.sub(r'\*(.*?)\*', r'\1', clean_text)      # Italic
-
-    # Convert checkboxes to simple bullets
-    clean_text = re.sub(r'- \[ \] ', '• ', clean_text)        # Empty checkboxes
-    clean_text = re.sub(r'- \[x\] ', '• ', clean_text)        # Checked checkboxes
-
-    # Clean up numbered lists (keep the numbers)
-    clean_text = re.sub(r'^(\d+)\. ', r'\1. ', clean_text, flags=re.MULTILINE)
-
-    # Clean up bullet points
-    clean_text = re.sub(r'^- ', '• ', clean_text, flags=re.MULTILINE)
-
-    return clean_text.strip()
-
 # Page configuration
 st.set_page_config(
     page_title="MoM Agent - Minutes of Meeting Generator",
@@ -73,6 +50,9 @@ def init_session_state():
     if 'data_manager' not in st.session_state:
         st.session_state.data_manager = DataManager()
     
+    if 'export_service' not in st.session_state:
+        st.session_state.export_service = ExportService(st.session_state.data_manager)
+    
     if 'ai_service' not in st.session_state:
         # Initialize OpenAI service with environment variables
         env_api_key = os.getenv("OPENAI_API_KEY", "").strip()
@@ -92,6 +72,9 @@ def init_session_state():
     
     if 'current_mom' not in st.session_state:
         st.session_state.current_mom = ""
+    
+    if 'duplicate_matches' not in st.session_state:
+        st.session_state.duplicate_matches = None
 
 # Clean MoM-only setup - no email services needed
 
@@ -208,6 +191,76 @@ def sidebar_projects():
                                         del st.session_state[f"confirm_delete_meeting_{project}_{meeting['id']}"]
                                         st.rerun()
 
+def save_draft_mom(meeting_data, mom, success_message):
+    """Store a new draft MoM on the meeting and refresh the page"""
+    meeting_data['draft_mom'] = mom
+    st.session_state.data_manager.save_meeting(st.session_state.selected_project, meeting_data)
+    st.session_state.current_mom = mom
+    st.session_state.duplicate_matches = None
+    st.success(success_message)
+    st.rerun()
+
+def generate_meeting_mom(meeting_data, transcript):
+    """Generate a MoM for the meeting from its transcript"""
+    with st.spinner("Generating Minutes of Meeting..."):
+        # Get project context
+        context = st.session_state.data_manager.get_project_context(st.session_state.selected_project)
+        
+        # Generate MoM
+        generated_mom = st.session_state.ai_service.generate_mom(
+            transcript, 
+            context, 
+            st.session_state.selected_project
+        )
+    
+    if generated_mom:
+        save_draft_mom(meeting_data, generated_mom, "✅ MoM generated successfully!")
+    else:
+        st.error("Failed to generate MoM. Please try again.")
+
+def duplicate_panel(meeting_data, transcript, matches):
+    """Let the user reuse or update the MoM of a near-duplicate meeting instead of generating a new one"""
+    st.warning("⚠️ Similar transcripts already have a MoM. Reuse one instead of generating again?")
+    
+    for match in matches:
+        other = match['meeting']
+        other_key = f"{match['project']}_{other['id']}"
+        similarity = "identical" if match['exact'] else f"{match['similarity']:.0%} similar"
+        st.markdown(f"**{other['title']}** ({match['project']}, {other['date']}) - {similarity}")
+        
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            if st.button("♻️ Reuse MoM", key=f"reuse_mom_{other_key}"):
+                reused_mom = rewrite_mom_header(meeting_mom(other), st.session_state.selected_project)
+                save_draft_mom(meeting_data, reused_mom, "✅ MoM reused from similar meeting!")
+        with col2:
+            # Identical transcripts have nothing to update, and a diff close to the
+            # transcript's own size costs as much as generating from scratch
+            added, removed = ("", "") if match['exact'] else transcript_changes(other.get('transcript', ''), transcript)
+            worth_updating = not match['exact'] and len(added) + len(removed) < len(transcript) / 2
+            if worth_updating and st.button("🔀 Update MoM from Changes", key=f"update_mom_{other_key}"):
+                with st.spinner("Updating Minutes of Meeting..."):
+                    updated_mom = st.session_state.ai_service.update_mom(
+                        meeting_mom(other),
+                        added,
+                        removed,
+                        st.session_state.selected_project
+                    )
+                if updated_mom:
+                    save_draft_mom(meeting_data, updated_mom, "✅ MoM updated from similar meeting!")
+                else:
+                    st.error("Failed to update MoM. Please try again.")
+    
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        if st.button("🤖 Generate Anyway", key="generate_anyway"):
+            st.session_state.duplicate_matches = None
+            generate_meeting_mom(meeting_data, transcript)
+    with col2:
+        if st.button("❌ Cancel", key="cancel_duplicates"):
+            st.session_state.duplicate_matches = None
+            st.rerun()
+
 def main_content():
     """Render main content area"""
     if not st.session_state.selected_project:
@@ -219,6 +272,19 @@ def main_content():
     if not st.session_state.selected_meeting:
         st.markdown(f'<div class="main-header">📁 {st.session_state.selected_project}</div>', unsafe_allow_html=True)
         st.info("👈 Select or create a meeting from the sidebar to continue.")
+        
+        if st.button("📦 Export All MoMs", key="export_project"):
+            with st.spinner("Exporting project MoMs..."):
+                archive = st.session_state.export_service.export_project(st.session_state.selected_project)
+            if archive:
+                st.download_button(
+                    "⬇️ Download Archive (.zip)",
+                    data=archive,
+                    file_name=f"{st.session_state.selected_project}_moms.zip",
+                    mime="application/zip"
+                )
+            else:
+                st.info("No MoMs to export in this project yet.")
         return
     
     # Load current meeting
@@ -255,30 +321,43 @@ def main_content():
                 meeting_data['transcript'] = transcript
                 st.session_state.data_manager.save_meeting(st.session_state.selected_project, meeting_data)
                 st.success("Transcript saved!")
+                
+                similar = st.session_state.data_manager.find_similar_meetings(
+                    transcript,
+                    st.session_state.selected_project,
+                    meeting_data['id']
+                )
+                if similar:
+                    titles = ", ".join(f"'{m['meeting']['title']}' ({m['project']})" for m in similar[:3])
+                    st.warning(f"⚠️ This transcript is a near-duplicate of: {titles}")
         
         with col2:
             if st.button("🤖 Generate MoM", type="primary", disabled=not transcript.strip()):
                 if transcript.strip():
-                    with st.spinner("Generating Minutes of Meeting..."):
-                        # Get project context
-                        context = st.session_state.data_manager.get_project_context(st.session_state.selected_project)
-                        
-                        # Generate MoM
-                        generated_mom = st.session_state.ai_service.generate_mom(
-                            transcript, 
-                            context, 
-                            st.session_state.selected_project
+                    meeting_data['transcript'] = transcript
+                    st.session_state.data_manager.save_meeting(st.session_state.selected_project, meeting_data)
+                    
+                    # Offer to reuse an existing MoM before spending a new generation
+                    similar = [
+                        m for m in st.session_state.data_manager.find_similar_meetings(
+                            transcript,
+                            st.session_state.selected_project,
+                            meeting_data['id']
                         )
-                        
-                        if generated_mom:
-                            meeting_data['transcript'] = transcript
-                            meeting_data['draft_mom'] = generated_mom
-                            st.session_state.data_manager.save_meeting(st.session_state.selected_project, meeting_data)
-                            st.session_state.current_mom = generated_mom
-                            st.success("✅ MoM generated successfully!")
-                            st.rerun()
-                        else:
-                            st.error("Failed to generate MoM. Please try again.")
+                        if meeting_mom(m['meeting'])
+                    ]
+                    if similar:
+                        st.session_state.duplicate_matches = {
+                            'meeting_id': meeting_data['id'],
+                            'matches': similar[:3]
+                        }
+                        st.rerun()
+                    else:
+                        generate_meeting_mom(meeting_data, transcript)
+        
+        duplicate_matches = st.session_state.duplicate_matches
+        if duplicate_matches and duplicate_matches['meeting_id'] == meeting_data['id']:
+            duplicate_panel(meeting_data, transcript, duplicate_matches['matches'])
         
         # Show generated MoM if exists
         if meeting_data.get('draft_mom'):
@@ -310,7 +389,7 @@ def main_content():
         with col2:
             if st.button("📋 Copy to Clipboard", type="primary"):
                 # Convert markdown to clean text and display
-                clean_text = markdown_to_clean_text(edited_mom)
+                clean_text = st.session_state.export_service.render(edited_mom).text
                 st.success("📋 Clean MoM ready to copy - use the copy button in the text block below:")
                 st.code(clean_text, language="text")
     
@@ -325,10 +404,27 @@ def main_content():
             # Copy button
             if st.button("📋 Copy Final MoM", type="primary", key="copy_final"):
                 # Convert markdown to clean text and display
-                clean_text = markdown_to_clean_text(final_mom)
+                clean_text = st.session_state.export_service.render(final_mom).text
                 st.success("📋 Clean Final MoM ready to copy - use the copy button in the text block below:")
                 st.code(clean_text, language="text")
 
+            # Download buttons
+            rendered = st.session_state.export_service.render_meeting(meeting_data)
+            file_stem = f"{meeting_data['id']}_{safe_filename(meeting_data['title'])}"
+            col1, col2, col3 = st.columns([1, 1, 1])
+            with col1:
+                st.download_button("⬇️ Text", data=rendered.text, file_name=f"{file_stem}.txt", mime="text/plain", key="download_txt")
+            with col2:
+                st.download_button("⬇️ HTML", data=rendered.html, file_name=f"{file_stem}.html", mime="text/html", key="download_html")
+            with col3:
+                st.download_button(
+                    "⬇️ Word",
+                    data=rendered.docx,
+                    file_name=f"{file_stem}.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+                    key="download_docx"
+                )
+
         else:
             st.info("No MoM generated yet. Go to 'Generate MoM' tab to create one.")
 
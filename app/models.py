@@ -4,6 +4,7 @@ from datetime import datetime
 from typing import List, Dict, Optional
 from dataclasses import dataclass, asdict
 from pathlib import Path
+from dedup_service import TranscriptIndex, DEFAULT_THRESHOLD
 
 @dataclass
 class Meeting:
@@ -33,6 +34,7 @@ class DataManager:
     def __init__(self, base_dir: str = "data"):
         self.base_dir = Path(base_dir)
         self.base_dir.mkdir(exist_ok=True)
+        self.transcript_index = TranscriptIndex(self.base_dir / "transcript_index.json", self._iter_transcripts)
     
     def get_projects(self) -> List[str]:
         """Get list of all project names"""
@@ -110,9 +112,29 @@ class DataManager:
         try:
             with open(meeting_file, 'w', encoding='utf-8') as f:
                 json.dump(meeting_data, f, indent=2, ensure_ascii=False)
-            return True
         except Exception:
             return False
+        
+        self.transcript_index.update(project_name, meeting_data['id'], meeting_data.get('transcript', ''))
+        return True
+    
+    def find_similar_meetings(self, transcript: str, project_name: str = None, meeting_id: str = None,
+                              threshold: float = DEFAULT_THRESHOLD) -> List[Dict]:
+        """Find saved meetings in any project whose transcript is a near-duplicate of this one"""
+        exclude_key = TranscriptIndex.make_key(project_name, meeting_id) if project_name and meeting_id else None
+        
+        similar = []
+        for key, similarity, exact in self.transcript_index.find_similar(transcript, exclude_key, threshold):
+            other_project, other_id = key.rsplit('/', 1)
+            meeting = self.get_meeting(other_project, other_id)
+            if meeting:
+                similar.append({
+                    'project': other_project,
+                    'meeting': meeting,
+                    'similarity': similarity,
+                    'exact': exact
+                })
+        return similar
     
     def get_project_context(self, project_name: str) -> str:
         """Get context from previous meetings in the project"""
@@ -134,6 +156,7 @@ class DataManager:
         try:
             if meeting_file.exists():
                 meeting_file.unlink()
+                self.transcript_index.remove(project_name, meeting_id)
                 return True
             return False
         except Exception:
@@ -146,11 +169,18 @@ class DataManager:
         try:
             if project_dir.exists():
                 shutil.rmtree(project_dir)
+                self.transcript_index.remove(project_name)
                 return True
             return False
         except Exception:
             return False
 
+    def _iter_transcripts(self):
+        """Yield (project_name, meeting_id, transcript) for every stored meeting"""
+        for project_name in self.get_projects():
+            for meeting in self.get_project_meetings(project_name):
+                yield project_name, meeting['id'], meeting.get('transcript', '')
+
     def _save_project_metadata(self, project_name: str, project: Project):
         """Save project metadata"""
         project_file = self.base_dir / project_name / "project.json"